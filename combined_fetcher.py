@@ -1,14 +1,31 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import orjson
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, date, timedelta, time as dtime
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.styles import Alignment
 from openpyxl.worksheet.dimensions import DimensionHolder, ColumnDimension
 from openpyxl.utils import get_column_letter
 import time
+import json
+import math
+import numbers
+import os
+import functools
+import hashlib
+import inspect
+import tempfile
+import threading
+from collections import deque
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+# Shared HTTP session so connections are pooled across calls and worker threads
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.3)))
 # Constants for DappRadar
 DAPP_RADAR_API_KEY = ''
 DAPP_RADAR_BASE_URL = 'https://apis.dappradar.com/v2/dapps/top/uaw'
@@ -16,17 +33,50 @@ DAPP_RADAR_RESULTS_TOP = 50
 DAPP_RADAR_CATEGORY = 'games'
 DAPP_RADAR_RANGE = '24h'
 DAPP_RADAR_DAPP_URL = 'https://apis.dappradar.com/v2/dapps/'
+DAPP_RADAR_MAX_WORKERS = 16
 # Constants for Artemis
 ARTEMIS_API_KEY = ''
 ARTEMIS_BASE_URL = 'https://api.artemisxyz.com'
+ARTEMIS_MAX_WORKERS = 8
 GAME_NAMES = [
 ]
 METRICS_OF_INTEREST = [
 ]
 METRICS_MAPPING = {
 }
+# Constants for CoinGecko (demo plan allows 30 requests per minute)
+COINGECKO_RATE_LIMIT = 30
+COINGECKO_RATE_PERIOD = 60
+COINGECKO_MAX_WORKERS = 8
+COINGECKO_IDS_CACHE = Path('~/.cache/coingecko_ids.json').expanduser()
+COINGECKO_IDS_TTL = 24 * 60 * 60
 
 file_path =  ''
+# Matches HTML tags and character entities stripped from descriptions
+CLEAN_RE = re.compile(r'<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
+
+# Sliding-window rate limiter shared by all threads hitting the same API
+class RateLimiter:
+    def __init__(self, max_calls, period):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        # Block only when max_calls requests were already issued in the last period
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                time.sleep(self.period - (now - self._calls[0]))
+
+COINGECKO_LIMITER = RateLimiter(COINGECKO_RATE_LIMIT, COINGECKO_RATE_PERIOD)
+
 # Function to fetch the top 50 ranking games based on UAW metric from DappRadar
 def fetch_top_ranking_games():
     headers = {
@@ -39,19 +89,18 @@ def fetch_top_ranking_games():
         'top': DAPP_RADAR_RESULTS_TOP
     }
     try:
-        response = requests.get(DAPP_RADAR_BASE_URL, headers=headers, params=params)
+        response = SESSION.get(DAPP_RADAR_BASE_URL, headers=headers, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data['results']
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching top ranking games from DappRadar: {e}")
         return []
 
 
 # Function to clean HTML tags from text
 def clean_html(raw_html):
-    clean_re = re.compile('<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
-    cleantext = re.sub(clean_re, '', raw_html)
+    cleantext = CLEAN_RE.sub('', raw_html)
     return cleantext
 
 def get_dapp_symbol(dapp_id):
@@ -62,9 +111,9 @@ def get_dapp_symbol(dapp_id):
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         tokens = data['results'].get('tokens', [])
         if not tokens:
             print("No tokens found in the response.")
@@ -72,57 +121,69 @@ def get_dapp_symbol(dapp_id):
         else:
             symbol = tokens[0].get('symbol', 'N/A')
             return symbol
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching Dapp symbol: {e}")
         return "N/A"
 
+# Function to fetch Dapp symbols concurrently, returned in the same order as dapp_ids
+def get_dapp_symbols(dapp_ids):
+    with ThreadPoolExecutor(max_workers=DAPP_RADAR_MAX_WORKERS) as executor:
+        return list(executor.map(get_dapp_symbol, dapp_ids))
+
 # Process the fetched data and map to desired structure
 def process_dappradar_data(top_games):
-    dapps = []
-    for game in top_games:
-        if 'games' in game.get('categories', []):
-            dapp_id = game.get('dappId')
-            metrics = game.get('metrics', {})
-            description = game.get('fullDescription', 'N/A')
-            cleaned_description = clean_html(description)
-            symbol = get_dapp_symbol(dapp_id) if dapp_id else 'N/A'
-            dapps.append({
-                'Name': game.get('name', 'N/A'),
-                'Symbol': symbol,
-                'Website': game.get('website', 'N/A'),
-                'Network': ', '.join(game.get('chains', [])),
-                'Genre': ', '.join(game.get('categories', [])),
-                'Unique Active Wallets (K) (30d)': metrics.get('uaw', 'N/A'),
-                'Circulating Market Cap ($M)': metrics.get('balance', 'N/A'),
-                'Volume ($M) (30d)': metrics.get('volume', 'N/A'),
-                'Comments': cleaned_description
-            })
-    df = pd.DataFrame(dapps)
+    games = [game for game in top_games if 'games' in game.get('categories', [])]
+    dapp_ids = [game.get('dappId') for game in games]
+    # Only qualifying games with an id cost a request; repeated ids are fetched once
+    ids_to_fetch = list(dict.fromkeys(dapp_id for dapp_id in dapp_ids if dapp_id))
+    fetched_symbols = dict(zip(ids_to_fetch, get_dapp_symbols(ids_to_fetch)))
+    symbols = [fetched_symbols.get(dapp_id, 'N/A') for dapp_id in dapp_ids]
+    metrics = [game.get('metrics', {}) for game in games]
+    # Build the frame column by column instead of from a list of row dicts
+    df = pd.DataFrame({
+        'Name': [game.get('name', 'N/A') for game in games],
+        'Symbol': symbols,
+        'Website': [game.get('website', 'N/A') for game in games],
+        'Network': [', '.join(game.get('chains', [])) for game in games],
+        'Genre': [', '.join(game.get('categories', [])) for game in games],
+        'Unique Active Wallets (K) (30d)': [m.get('uaw', 'N/A') for m in metrics],
+        'Circulating Market Cap ($M)': [m.get('balance', 'N/A') for m in metrics],
+        'Volume ($M) (30d)': [m.get('volume', 'N/A') for m in metrics],
+        'Comments': [game.get('fullDescription', 'N/A') for game in games]
+    })
+    # Strip HTML from every description in a single vectorized pass
+    if not df.empty:
+        df['Comments'] = df['Comments'].str.replace(CLEAN_RE, '', regex=True)
     return df
 # Function to fetch supported assets from Artemis
 def fetch_supported_assets():
     url = f"{ARTEMIS_BASE_URL}/asset"
     params = {"APIKey": ARTEMIS_API_KEY}
-    response = requests.get(url, headers={"Accept": "application/json"}, params=params)
-    return response.json().get('assets', [])
+    response = SESSION.get(url, headers={"Accept": "application/json"}, params=params)
+    return orjson.loads(response.content).get('assets', [])
 
 # Function to get valid Artemis IDs for the game names
 def get_valid_artemis_ids(game_names, supported_assets):
+    # Index assets by id once; setdefault keeps the first match like the old linear scan
+    assets_by_id = {}
+    for asset in supported_assets:
+        assets_by_id.setdefault(asset['artemis_id'], asset)
+
     valid_ids = {}
     for game in game_names:
-        for asset in supported_assets:
-            if game.lower().replace(' ', '-') == asset['artemis_id']:
-                valid_ids[game] = asset
-                break
+        asset = assets_by_id.get(game.lower().replace(' ', '-'))
+        if asset is not None:
+            valid_ids[game] = asset
     return valid_ids
 
-# Function to fetch available metrics for an Artemis ID
+# Function to fetch available metrics for an Artemis ID (cached per id for the process)
+@functools.lru_cache(maxsize=None)
 def fetch_available_metrics(artemis_id):
     url = f"{ARTEMIS_BASE_URL}/asset/{artemis_id}/metric"
     params = {"APIKey": ARTEMIS_API_KEY}
-    response = requests.get(url, headers={"Accept": "application/json"}, params=params)
+    response = SESSION.get(url, headers={"Accept": "application/json"}, params=params)
     if response.status_code == 200:
-        return response.json().get('metrics', [])
+        return orjson.loads(response.content).get('metrics', [])
     else:
         print(f"Error fetching metrics for {artemis_id}: {response.status_code}")
         return []
@@ -132,77 +193,201 @@ def fetch_metrics_data(artemis_id, metrics):
     metric_str = ','.join(metrics)
     url = f"{ARTEMIS_BASE_URL}/data/{metric_str}"
     params = {"artemisIds": artemis_id, "APIKey": ARTEMIS_API_KEY}
-    response = requests.get(url, headers={"Accept": "application/json"}, params=params)
+    response = SESSION.get(url, headers={"Accept": "application/json"}, params=params)
     if response.status_code == 200:
-        return response.json().get('data', {}).get('artemis_ids', {}).get(artemis_id, {})
+        return orjson.loads(response.content).get('data', {}).get('artemis_ids', {}).get(artemis_id, {})
     else:
         print(f"Error fetching data for {artemis_id}: {response.status_code}")
         return {}
 
+# Function to fetch data for a set of metrics for several Artemis IDs in one request
+def fetch_metrics_data_batch(artemis_ids, metrics):
+    metric_str = ','.join(metrics)
+    url = f"{ARTEMIS_BASE_URL}/data/{metric_str}"
+    params = {"artemisIds": ','.join(artemis_ids), "APIKey": ARTEMIS_API_KEY}
+    response = SESSION.get(url, headers={"Accept": "application/json"}, params=params)
+    if response.status_code == 200:
+        return orjson.loads(response.content).get('data', {}).get('artemis_ids', {})
+    else:
+        print(f"Error fetching batched data for {len(artemis_ids)} assets: {response.status_code}")
+        return {}
+
 # Function to process the fetched Artemis data and map to desired structure
 def process_artemis_data(valid_artemis_ids):
-    data_list = []
-    for game, asset in valid_artemis_ids.items():
-        print(f"Processing {game}...")
-        artemis_id = asset['artemis_id']
-        symbol = asset['symbol']
-        all_metrics = fetch_available_metrics(artemis_id)
-        common_metrics = list(set(METRICS_OF_INTEREST).intersection(all_metrics))
+    # Discover each asset's metrics concurrently, then fetch every asset's data in one batched call
+    games = list(valid_artemis_ids.items())
+    with ThreadPoolExecutor(max_workers=ARTEMIS_MAX_WORKERS) as executor:
+        available_metrics = list(executor.map(fetch_available_metrics, [asset['artemis_id'] for _, asset in games]))
 
+    common_metrics_by_game = {}
+    for (game, asset), all_metrics in zip(games, available_metrics):
+        common_metrics = list(set(METRICS_OF_INTEREST).intersection(all_metrics))
         if common_metrics:
-            data = fetch_metrics_data(artemis_id, common_metrics)
-            game_data = {"Name": game, "Symbol": symbol}
-            for metric in common_metrics:
-                game_data[METRICS_MAPPING[metric]] = data.get(metric)
-            data_list.append(game_data)
+            common_metrics_by_game[game] = common_metrics
         else:
             print(f"No common metrics available for {game}")
 
-    df = pd.DataFrame(data_list)
+    batch_data = {}
+    if common_metrics_by_game:
+        batch_ids = [valid_artemis_ids[game]['artemis_id'] for game in common_metrics_by_game]
+        batch_metrics = sorted(set().union(*common_metrics_by_game.values()))
+        batch_data = fetch_metrics_data_batch(batch_ids, batch_metrics)
+
+    # Columns are filled in lockstep; metrics an asset lacks are padded with None
+    columns = {"Name": [], "Symbol": []}
+    num_rows = 0
+    for game, common_metrics in common_metrics_by_game.items():
+        print(f"Processing {game}...")
+        asset = valid_artemis_ids[game]
+        artemis_id = asset['artemis_id']
+        data = batch_data.get(artemis_id)
+        if data is None:
+            # Fall back to a single-asset request for ids missing from the batched response
+            data = fetch_metrics_data(artemis_id, common_metrics)
+        columns["Name"].append(game)
+        columns["Symbol"].append(asset['symbol'])
+        for metric in common_metrics:
+            columns.setdefault(METRICS_MAPPING[metric], [None] * num_rows).append(data.get(metric))
+        num_rows += 1
+        for values in columns.values():
+            if len(values) < num_rows:
+                values.append(None)
+
+    df = pd.DataFrame(columns)
     return df
 
+# Parsed input files are pickled here, keyed on (loader, path) plus (loader code, mtime, size)
+INPUT_CACHE_DIR = Path(__file__).with_name('.cache')
+
+def _short_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+# Decorator that skips re-parsing an unchanged input file by reusing a pickled DataFrame
+def file_cache(loader):
+    # Editing the loader (usecols, sheet_name, date parsing, ...) invalidates its cached frames
+    try:
+        loader_version = _short_hash(inspect.getsource(loader))
+    except (OSError, TypeError):
+        loader_version = hashlib.sha256(loader.__code__.co_code).hexdigest()[:16]
+
+    @functools.wraps(loader)
+    def wrapper(file_path):
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        # One cache file per (loader, path); the suffix changes whenever the loader or input does
+        prefix = f"{loader.__name__}_{_short_hash(str(path))}"
+        cache_path = INPUT_CACHE_DIR / f"{prefix}_{_short_hash(f'{loader_version}|{stat.st_mtime_ns}|{stat.st_size}')}.pkl"
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception:
+            # Missing, truncated or written by another pandas version: re-parse
+            pass
+
+        df = loader(file_path)
+        try:
+            INPUT_CACHE_DIR.mkdir(exist_ok=True)
+            # A unique temp file per writer, since the same input can be loaded from several threads
+            with tempfile.NamedTemporaryFile(dir=INPUT_CACHE_DIR, suffix='.tmp', delete=False) as tmp:
+                tmp_path = Path(tmp.name)
+            try:
+                df.to_pickle(tmp_path)
+                os.replace(tmp_path, cache_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            # Drop pickles left behind by earlier versions of this loader or input file
+            for stale in INPUT_CACHE_DIR.glob(f"{prefix}_*.pkl"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Error writing input cache for {path}: {e}")
+        return df
+    return wrapper
+
 #Process Combined Artemis Data
+@file_cache
 def process_new_applications_data(file_path):
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, engine='pyarrow')
     print(df.columns)  # Print the headers to verify
     df = df.sort_values(by='activeAddresses', ascending=False)
     return df
 
+@file_cache
 def process_affinity_file(file_path):
     # Load the excel file and print the column names to verify
-    df = pd.read_excel(file_path)
+    df = pd.read_excel(file_path, engine='openpyxl')
     print("Affinity file columns:", df.columns)
     return df
 
 
-def process_combined_cryptorank_data():
-    file_path = Path(__file__).with_name('')
-    df = pd.read_excel(file_path, sheet_name='')
+@file_cache
+def process_combined_cryptorank_data(file_path):
+    df = pd.read_excel(file_path, sheet_name='', engine='openpyxl')
+    # Parse unlock dates once at load so later sorts compare datetime64 values
+    if 'Date of Next Unlock' in df.columns:
+        df['Date of Next Unlock'] = pd.to_datetime(df['Date of Next Unlock'], errors='coerce')
     print("Processed CryptoRank Columns:", df.columns)
     return df
 
+def parse_unlock_dates(values):
+    return pd.to_datetime(values, errors='coerce', format='mixed')
+
+@file_cache
 def process_vesting_file(file_path):
-    df = pd.read_csv(file_path, header=None, encoding='ISO-8859-1', usecols=[0, 1, 2, 3, 4, 5, 6, 8])
-    df.columns = ['Company Name', 'Percentage Unlocked', 'Percentage Locked', 'Unlocked Value', 'Locked Value', 'Next Round Value (%)', 'Next Round Value ($)', 'Date of Next Unlock']
+    # Columns are named at parse time rather than reassigned afterwards
+    df = pd.read_csv(file_path, header=None, encoding='ISO-8859-1', engine='c', usecols=[0, 1, 2, 3, 4, 5, 6, 8],
+                     names=['Company Name', 'Percentage Unlocked', 'Percentage Locked', 'Unlocked Value', 'Locked Value', 'Next Round Value (%)', 'Next Round Value ($)', 'Date of Next Unlock'])
+    # Parse each value on its own (format='mixed'); anything still unparseable (e.g. 'TBA') keeps its text
+    raw_dates = df['Date of Next Unlock']
+    parsed_dates = parse_unlock_dates(raw_dates)
+    unparsed = parsed_dates.isna() & raw_dates.notna()
+    if unparsed.any():
+        print(f"{file_path}: kept {int(unparsed.sum())} unparsed 'Date of Next Unlock' values as text")
+    df['Date of Next Unlock'] = parsed_dates.astype(object).where(parsed_dates.notna(), raw_dates)
     # Extract the first string in 'Unlocked Value' to create 'Token Ticker' column
-    df['Token Ticker'] = df['Unlocked Value'].apply(lambda x: str(x).split()[0] if pd.notna(x) else 'N/A')
+    # NaN propagates through the string accessor, so missing values fall through to fillna
+    df['Token Ticker'] = df['Unlocked Value'].astype('string').str.split(n=1).str[0].fillna('N/A')
     # Reorder columns to insert 'Token Ticker' after 'Company Name'
     columns = ['Company Name', 'Token Ticker', 'Percentage Unlocked', 'Percentage Locked', 'Unlocked Value', 'Locked Value', 'Next Round Value (%)', 'Next Round Value ($)', 'Date of Next Unlock']
     df = df[columns]
     return df
+# Function to fetch the CoinGecko name -> id map, cached on disk for COINGECKO_IDS_TTL seconds
+@functools.lru_cache(maxsize=1)
 def get_all_coingecko_ids():
+    try:
+        if time.time() - COINGECKO_IDS_CACHE.stat().st_mtime < COINGECKO_IDS_TTL:
+            with COINGECKO_IDS_CACHE.open(encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
     url = "https://api.coingecko.com/api/v3/coins/list"
     headers = {
         "accept": "application/json",
         "x-cg-demo-api-key": ""
     }
-    response = requests.get(url, headers=headers)
+    COINGECKO_LIMITER.wait()
+    response = SESSION.get(url, headers=headers)
     if response.status_code == 200:
-        return {coin['name']: coin['id'] for coin in response.json()}
+        coingecko_ids = {coin['name']: coin['id'] for coin in orjson.loads(response.content)}
+        try:
+            # Write to a temp file first so a crash never leaves a truncated cache behind
+            COINGECKO_IDS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = COINGECKO_IDS_CACHE.with_suffix('.tmp')
+            with tmp_path.open('w', encoding='utf-8') as f:
+                json.dump(coingecko_ids, f)
+            os.replace(tmp_path, COINGECKO_IDS_CACHE)
+        except OSError as e:
+            print(f"Error writing CoinGecko ids cache: {e}")
+        return coingecko_ids
+
+# Function to run a CoinGecko fetch for many coin ids concurrently, preserving order
+def fetch_coingecko_concurrently(fetch, coin_ids):
+    with ThreadPoolExecutor(max_workers=COINGECKO_MAX_WORKERS) as executor:
+        return list(executor.map(fetch, coin_ids))
 
 # Function to add CoinGecko hyperlinks and exchanges data
-
-def add_coingecko_hyperlink(df, name_column):
+# Columns are added to df in place; pass copy=True to leave the caller's frame untouched
+def add_coingecko_hyperlink(df, name_column, copy=False):
     coingecko_ids = get_all_coingecko_ids()
     def fetch_exchanges(coin_id):
         url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/tickers"
@@ -211,9 +396,10 @@ def add_coingecko_hyperlink(df, name_column):
             "x-cg-demo-api-key": ""
         }
         try:
-            response = requests.get(url, headers=headers)
+            COINGECKO_LIMITER.wait()
+            response = SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                tickers = response.json().get('tickers', [])
+                tickers = orjson.loads(response.content).get('tickers', [])
                 exchanges = [ticker['market']['name'] for ticker in tickers]
                 return exchanges[:10] + ["N/A"] * (10 - len(exchanges))  # Ensure list has exactly 10 items
             else:
@@ -221,35 +407,29 @@ def add_coingecko_hyperlink(df, name_column):
         except Exception as e:
             return ["N/A"] * 10
 
-    def check_coingecko_link(name):
-        coin_id = coingecko_ids.get(name)
-        if coin_id:
-            return coin_id
-        return None
-
     if name_column not in df.columns:
         print(f"Column {name_column} not found in DataFrame. Available columns: {df.columns}")
         return df
 
-    df = df.copy()
-    df['CoinGecko ID'] = df[name_column].apply(lambda x: check_coingecko_link(x))
+    if copy:
+        df = df.copy()
+    # Names without a CoinGecko entry map to NaN and are dropped below
+    df['CoinGecko ID'] = df[name_column].map(coingecko_ids)
 
     valid_rows = df.dropna(subset=['CoinGecko ID']).head(30)
     valid_indices = valid_rows.index
 
-    df['CoinGecko Link'] = df[name_column].apply(lambda x: f'=HYPERLINK("https://www.coingecko.com/en/coins/{x.lower().replace(" ", "-")}", "{x}")')
-
-    exchanges_list = []
-    for coin_id in valid_rows['CoinGecko ID']:
-        exchanges = fetch_exchanges(coin_id)
-        exchanges_list.append(exchanges)
-        time.sleep(2)  # Respect the rate limit (30 requests per minute)
+    names = df[name_column]
+    slugs = names.str.lower().str.replace(' ', '-', regex=False)
+    df['CoinGecko Link'] = '=HYPERLINK("https://www.coingecko.com/en/coins/' + slugs + '", "' + names + '")'
 
-    exchanges_df = pd.DataFrame(exchanges_list, columns=[f'Exchange_{i+1}' for i in range(10)], index=valid_indices)
-    for i in range(10):
-        df[f'Exchange_{i+1}'] = "N/A"
+    exchanges_list = fetch_coingecko_concurrently(fetch_exchanges, valid_rows['CoinGecko ID'])
 
-    df.update(exchanges_df)
+    exchange_columns = [f'Exchange_{i+1}' for i in range(10)]
+    df[exchange_columns] = "N/A"
+    # Bulk positional assignment; fetch_exchanges always returns exactly 10 names per coin
+    if len(valid_indices):
+        df.loc[valid_indices, exchange_columns] = exchanges_list
     return df
 
 def fetch_top_gaming_cryptos():
@@ -261,9 +441,10 @@ def fetch_top_gaming_cryptos():
         'per_page': 90,
         'page': 1
     }
-    response = requests.get(url, params=params)
+    COINGECKO_LIMITER.wait()
+    response = SESSION.get(url, params=params)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 # Fetch the exchange platforms for a given cryptocurrency from CoinGecko
 def fetch_crypto_exchanges(coin_id):
@@ -272,9 +453,10 @@ def fetch_crypto_exchanges(coin_id):
         "accept": "application/json",
         "x-cg-demo-api-key": ""
     }
-    response = requests.get(url, headers=headers)
+    COINGECKO_LIMITER.wait()
+    response = SESSION.get(url, headers=headers)
     if response.status_code == 200:
-        tickers = response.json().get('tickers', [])
+        tickers = orjson.loads(response.content).get('tickers', [])
         exchanges = [ticker['market']['name'] for ticker in tickers]
         return exchanges[:10]  # Return top 10 exchanges
     else:
@@ -283,80 +465,102 @@ def fetch_crypto_exchanges(coin_id):
 # Process the top gaming cryptocurrencies and return as a DataFrame
 def process_top_gaming_cryptos():
     top_gaming_cryptos = fetch_top_gaming_cryptos()
-    crypto_data = []
-    for crypto in top_gaming_cryptos:
-        coin_id = crypto['id']
-        name = crypto['name']
-        symbol = crypto['symbol']
-        exchanges = fetch_crypto_exchanges(coin_id)
-        crypto_data.append({
-            'Name': name,
-            'Ticker Symbol': symbol,
-            'Exchanges': ', '.join(exchanges)
-        })
-    df = pd.DataFrame(crypto_data)
+    exchanges_list = fetch_coingecko_concurrently(fetch_crypto_exchanges, [crypto['id'] for crypto in top_gaming_cryptos])
+    df = pd.DataFrame({
+        'Name': [crypto['name'] for crypto in top_gaming_cryptos],
+        'Ticker Symbol': [crypto['symbol'] for crypto in top_gaming_cryptos],
+        'Exchanges': [', '.join(exchanges) for exchanges in exchanges_list]
+    })
     return df
 
 #Combined_Excel
+EXCEL_PREP_WORKERS = 4
+
+URL_SAMPLE_SIZE = 32
+
+# Function to detect and remove URL columns
+def remove_url_columns(df):
+    # A URL column shows it in its first few non-null values, so only those are tested
+    url_columns = [col for col in df.columns
+                   if df[col].dropna().head(URL_SAMPLE_SIZE).astype(str).str.startswith(('http://', 'https://')).any()]
+    return df.drop(columns=url_columns)
+
+# Function to compute column widths based on max length of data and column name
+def get_column_widths(df):
+    # str.len on the nullable string dtype measures a whole column in C; NA cells are skipped by max()
+    widths = []
+    for col in df.columns:
+        max_len = df[col].astype('string').str.len().max()
+        widths.append(max(int(max_len) if pd.notna(max_len) else 0, len(str(col))) + 2)
+    return widths
+
+# Function to filter and sort CryptoRank data for its sheet
+def prepare_cryptorank_sheet(df):
+    df = remove_url_columns(df)
+    # Sort by 'Market Cap', then by next unlock date when available
+    df = df.sort_values(by='Market Cap', ascending=False)
+    if 'Date of Next Unlock' in df.columns:
+        df = df.sort_values(by='Date of Next Unlock', ascending=True)
+    return df
+
+# Function to sort vesting data by next unlock date for its sheet
+def prepare_vesting_sheet(df):
+    # The column mixes Timestamps with unparsed text, so sort on the parsed dates; text rows go last
+    return df.sort_values(by='Date of Next Unlock', ascending=True, key=parse_unlock_dates)
+
+# Function to run a sheet's preparation step and precompute its column widths
+def prepare_sheet(sheet_name, df, prepare=None):
+    if prepare is not None:
+        df = prepare(df)
+    return sheet_name, df, get_column_widths(df)
+
+# Cell types xlsxwriter writes natively; anything else is stringified as to_excel did
+EXCEL_NATIVE_TYPES = (str, numbers.Number, date, dtime, timedelta)
+
+def excel_cell_value(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        # Matches to_excel's inf_rep; xlsxwriter's write_number rejects infinities
+        return 'inf' if value > 0 else '-inf'
+    if isinstance(value, EXCEL_NATIVE_TYPES):
+        return value
+    # Lists, dicts and other objects (e.g. from metric payloads) are written as text
+    return str(value)
+
+# Function to write a DataFrame row by row, as constant_memory mode requires
+def write_sheet_rows(workbook, sheet_name, df, widths, header_format=None):
+    worksheet = workbook.add_worksheet(sheet_name)
+    for idx, width in enumerate(widths):
+        worksheet.set_column(idx, idx, width)
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+    # xlsxwriter rejects NaN/NaT, so missing values become blank cells like to_excel's na_rep=''
+    rows = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(rows.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, [excel_cell_value(value) for value in row])
+
 def create_combined_excel(top_gaming_cryptos_df, dappradar_df, artemis_df, cryptorank_df, new_applications_df, vesting_df,  common_affinity_cryptorank, common_artemis_cryptorank, common_dappradar_cryptorank, common_applications_cryptorank, affinity_df, file_path):
-    # Function to detect and remove URL columns
-    def remove_url_columns(df):
-        url_columns = df.apply(lambda col: col.astype(str).str.startswith('http').any())
-        return df.loc[:, ~url_columns]
-
-    artemis_df = remove_url_columns(artemis_df)
-    new_applications_df = remove_url_columns(new_applications_df)
-    cryptorank_df = remove_url_columns(cryptorank_df)
-    # Sort cryptorank_df by 'Market Cap'
-    cryptorank_df = cryptorank_df.sort_values(by='Market Cap', ascending=False)
-    with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-        # Helper function to set column widths based on max length of data and column name
-        def set_column_widths(worksheet, df):
-            for idx, col in enumerate(df.columns):
-                max_len = max(df[col].dropna().astype(str).map(len).max(), len(col)) + 2 if not df[col].empty else len(col) + 2
-                worksheet.set_column(idx, idx, max_len)
-
-
-        # Sheet 1: DappRadar
-        dappradar_df.to_excel(writer, index=False, sheet_name='DappRadar')
-        dappradar_worksheet = writer.sheets['DappRadar']
-        set_column_widths(dappradar_worksheet, dappradar_df)
-
-        # Sheet 2: Artemis
-        artemis_df.to_excel(writer, index=False, sheet_name='Artemis')
-        artemis_worksheet = writer.sheets['Artemis']
-        set_column_widths(artemis_worksheet, artemis_df)
-
-        # Sheet 3: CryptoRank
-        if 'Date of Next Unlock' in cryptorank_df.columns:
-            cryptorank_df['Date of Next Unlock'] = pd.to_datetime(cryptorank_df['Date of Next Unlock'], errors='coerce')
-            cryptorank_df = cryptorank_df.sort_values(by='Date of Next Unlock', ascending=True)
-        cryptorank_df.to_excel(writer, index=False, sheet_name='CryptoRank')
-        cryptorank_worksheet = writer.sheets['CryptoRank']
-        set_column_widths(cryptorank_worksheet, cryptorank_df)
-
-
-        # Extra Sourcing
-        new_applications_df.to_excel(writer, index=False, sheet_name='Extra_Sourcing')
-        extra_sourcing_worksheet = writer.sheets['Extra_Sourcing']
-        set_column_widths(extra_sourcing_worksheet, new_applications_df)
-
-        # Vesting Information
-        vesting_df_sorted = vesting_df.sort_values(by='Date of Next Unlock', ascending=True)
-        vesting_df_sorted.to_excel(writer, index=False, sheet_name='vesting_cryptorank')
-        vesting_cryptorank_worksheet = writer.sheets['vesting_cryptorank']
-        set_column_widths(vesting_cryptorank_worksheet, vesting_df_sorted)
-
-
-        # Add the CoinGecko gaming cryptocurrencies sheet
-        top_gaming_cryptos_df.to_excel(writer, index=False, sheet_name='Top_CoinGecko_Gaming')
-        top_gaming_cryptos_worksheet = writer.sheets['Top_CoinGecko_Gaming']
-        set_column_widths(top_gaming_cryptos_worksheet, top_gaming_cryptos_df)
-
-        # Add a separate sheet for Affinity data
-        affinity_df.to_excel(writer, index=False, sheet_name='Affinity_Data')
-        affinity_worksheet = writer.sheets['Affinity_Data']
-        set_column_widths(affinity_worksheet, affinity_df)
+    # (sheet name, frame, preparation step) in the order the sheets appear in the workbook
+    sheets = [
+        ('DappRadar', dappradar_df, None),
+        ('Artemis', artemis_df, remove_url_columns),
+        ('CryptoRank', cryptorank_df, prepare_cryptorank_sheet),
+        ('Extra_Sourcing', new_applications_df, remove_url_columns),
+        ('vesting_cryptorank', vesting_df, prepare_vesting_sheet),
+        ('Top_CoinGecko_Gaming', top_gaming_cryptos_df, None),
+        ('Affinity_Data', affinity_df, None),
+    ]
+    # Sheets are independent, so filtering, sorting and width scans run in parallel;
+    # xlsxwriter is not thread-safe, so the workbook itself is written from this thread
+    with ThreadPoolExecutor(max_workers=EXCEL_PREP_WORKERS) as executor:
+        prepared_sheets = list(executor.map(lambda sheet: prepare_sheet(*sheet), sheets))
+
+    # constant_memory flushes each row to disk as soon as the next one starts
+    workbook_options = {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'}
+    with pd.ExcelWriter(file_path, engine='xlsxwriter', engine_kwargs={'options': workbook_options}) as writer:
+        header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        for sheet_name, df, widths in prepared_sheets:
+            write_sheet_rows(writer.book, sheet_name, df, widths, header_format)
 
     print(f"Excel file has been created at: {file_path}")
 
@@ -369,6 +573,7 @@ def main():
     vesting_file_1 = Path(__file__).with_name('')
     vesting_file_2 = Path(__file__).with_name('')
     applications_file = Path(__file__).with_name('')
+    cryptorank_file = Path(__file__).with_name('')
 
     # Fetch data from DappRadar
     top_games = fetch_top_ranking_games()
@@ -385,21 +590,23 @@ def main():
     artemis_df = process_artemis_data(valid_artemis_ids)
 
     # Process the vesting files
-    vesting_df1 = process_vesting_file(vesting_file_1)
-    vesting_df2 = process_vesting_file(vesting_file_2)
-    vesting_df = pd.concat([vesting_df1, vesting_df2])
+    # The two files are independent, so they are parsed concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vesting_df1, vesting_df2 = executor.map(process_vesting_file, [vesting_file_1, vesting_file_2])
+    vesting_df = pd.concat([vesting_df1, vesting_df2], ignore_index=True)
 
     # Process the combined cryptorank data
-    cryptorank_df = process_combined_cryptorank_data()
+    cryptorank_df = process_combined_cryptorank_data(cryptorank_file)
 
     # Process new applications data
     new_applications_df = process_new_applications_data(applications_file)
 
     # Find common companies
-    common_artemis_cryptorank = set(artemis_df['Name']).intersection(set(cryptorank_df['Company Name']))
-    common_dappradar_cryptorank = set(dappradar_df['Name']).intersection(set(cryptorank_df['Company Name']))
-    common_applications_cryptorank = set(new_applications_df['label']).intersection(set(cryptorank_df['Company Name']))
-    common_affinity_cryptorank = set(affinity_df['Organization Name']).intersection(set(cryptorank_df['Company Name']))
+    cryptorank_names = pd.Index(cryptorank_df['Company Name'])
+    common_artemis_cryptorank = pd.Index(artemis_df['Name']).intersection(cryptorank_names)
+    common_dappradar_cryptorank = pd.Index(dappradar_df['Name']).intersection(cryptorank_names)
+    common_applications_cryptorank = pd.Index(new_applications_df['label']).intersection(cryptorank_names)
+    common_affinity_cryptorank = pd.Index(affinity_df['Organization Name']).intersection(cryptorank_names)
     top_gaming_cryptos_df = process_top_gaming_cryptos()
     # Create a combined Excel file with the updated structure
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -5,8 +5,31 @@ Logic-based analysis (no LLM calls).
 """
 from __future__ import annotations
 import json
+import math
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+try:
+    import orjson as _json
+    _HAS_ORJSON = True
+except ImportError:  # stdlib fallback; both accept bytes and raise ValueError subclasses
+    import json as _json
+    _HAS_ORJSON = False
+
+try:
+    from tqdm import tqdm
+except ImportError:  # progress falls back to periodic prints
+    tqdm = None
+
+try:
+    import ijson
+except ImportError:  # load_id_lookup falls back to a full load_json
+    ijson = None
 
 # ---------- Configuration ----------
 ROOT = Path(__file__).resolve().parent
@@ -19,102 +42,230 @@ DATASET_PATH = DATA_DIR / "olympiadbench_test_sampled_50.json"
 AGENT_EVAL_PATH = ANALYSIS_DIR / "agent_evaluation.json"
 PREDICTIONS_PATH = OUTPUTS_DIR / "agents" / "predictions_sample50_mt.json"
 OUTPUT_PATH = ANALYSIS_DIR / "manual_annotations.json"
+PROGRESS_EVERY = 10
+
+# ---------- Answer Normalization ----------
+_TEXT_RE = re.compile(r'\\text\{([^}]+)\}')
+_BOXED_RE = re.compile(r'\\boxed\{([^}]+)\}')
+_STRIP_TABLE = str.maketrans('', '', '$\\ {}')
 
 # ---------- Utilities ----------
+def _loads(raw: bytes) -> Any:
+    """Decode JSON with orjson, retrying with the stdlib for NaN/Infinity literals orjson rejects."""
+    try:
+        return _json.loads(raw)
+    except ValueError:
+        if not _HAS_ORJSON:
+            raise
+        return json.loads(raw)
+
 def load_json(path: Path) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"Missing: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _loads(path.read_bytes())
+
+def load_id_lookup(path: Path) -> Dict[str, Any]:
+    """Build {str(id): item} from a JSON array, streaming items so the full list is never held."""
+    if ijson is None:
+        return {str(item["id"]): item for item in load_json(path)}
+    if not path.exists():
+        raise FileNotFoundError(f"Missing: {path}")
+    try:
+        with path.open("rb") as f:
+            return {str(item["id"]): item for item in ijson.items(f, "item", use_float=True)}
+    except ijson.JSONError:
+        # ijson rejects NaN/Infinity and >64-bit ints; load_json accepts both
+        return {str(item["id"]): item for item in load_json(path)}
+
+def _has_nonfinite(obj: Any) -> bool:
+    """True if obj holds a NaN/Infinity float anywhere (orjson would write those as null)."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(v) for v in obj)
+    return False
 
 def save_json(data: Any, path: Path):
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    encoded = None
+    if _HAS_ORJSON and not _has_nonfinite(data):
+        # orjson emits UTF-8 bytes directly, skipping the str build and encode round trip.
+        # Values read back identically, though float spelling can differ (1e-05 -> 0.00001).
+        try:
+            encoded = _json.dumps(data, option=_json.OPT_INDENT_2 | _json.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError, e.g. ints beyond 64 bits; use the stdlib writer
+            pass
+    if encoded is not None:
+        path.write_bytes(encoded)
+    else:
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"Saved: {path}")
 
 # ---------- Trace Loading ----------
-def load_trace(trace_file: str) -> List[Dict]:
+# Shared read-only stand-in for events without a data payload
+_EMPTY_DATA: Mapping[str, Any] = MappingProxyType({})
+
+class Event(NamedTuple):
+    """A single trace event with its top-level fields unpacked once at load time."""
+    agent: Optional[str]
+    event: Optional[str]
+    data: Mapping[str, Any]
+
+def _intern(value: Any) -> Any:
+    """Intern str values; pass anything else (e.g. None) through unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+def to_event(raw: Dict[str, Any]) -> Event:
+    """Convert a decoded JSON trace record into an Event."""
+    # agent/event come from a tiny vocabulary; interning dedupes them across the trace and
+    # lets comparisons against the (interned) literals in _EVENT_HANDLERS hit the identity fast path
+    return Event(_intern(raw.get("agent")), _intern(raw.get("event")), raw.get("data") or _EMPTY_DATA)
+
+def load_trace(trace_file: str) -> List[Event]:
     """Load trace file as list of events."""
     p = Path(trace_file)
-    if not p.exists():
+    # One stat covers both the missing-file and the empty-file case
+    try:
+        if p.stat().st_size == 0:
+            return []
+    except OSError:
         return []
     
     events = []
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    events.append(json.loads(line))
-                except:
-                    pass
+    for line in p.read_bytes().splitlines():
+        if line.strip():
+            try:
+                raw = _loads(line)
+            except ValueError:
+                continue
+            if isinstance(raw, dict):
+                events.append(to_event(raw))
     return events
 
 # ---------- Trace Analysis Helpers ----------
-def get_agent_sequence(trace: List[Dict]) -> List[str]:
-    """Extract ordered list of agents that executed."""
+@dataclass
+class TraceSummary:
+    """Fields extracted from a trace in a single pass."""
+    agent_sequence: List[str] = field(default_factory=list)
+    solver_answer: str = ""
+    refiner_answer: str = ""
+    solver_completion_head: Optional[str] = None  # content_head of first solver completion, if any
+    checker_verdict: str = ""
+    arbiter_choice: str = ""
+    ended: bool = False
+
+def _keep_first(key: str, field_name: str):
+    """Handler that records a data field from the first matching event only."""
+    def handler(state: Dict[str, Any], data: Mapping[str, Any]) -> None:
+        if state[key] is None:
+            state[key] = data.get(field_name, "") or ""
+    return handler
+
+def _keep_last(key: str, field_name: str):
+    """Handler that records a data field from the last matching event with a non-empty value."""
+    def handler(state: Dict[str, Any], data: Mapping[str, Any]) -> None:
+        state[key] = data.get(field_name, "") or state[key]
+    return handler
+
+def _keep_fallback(key: str, final_key: str, field_name: str):
+    """Handler that snapshots a fallback snippet only while no final answer has been seen."""
+    def handler(state: Dict[str, Any], data: Mapping[str, Any]) -> None:
+        if state[final_key] is None and state[key] is None:
+            state[key] = (data.get(field_name, "") or "")[:100]
+    return handler
+
+# (agent, event) -> handler; one dict lookup replaces the per-event if-chain
+_EVENT_HANDLERS = {
+    ("solver", "final_extracted"): _keep_first("solver_final", "final_answer"),
+    ("solver", "completion_received"): _keep_first("solver_head", "content_head"),
+    ("refiner", "final_extracted"): _keep_first("refiner_final", "final_answer"),
+    ("refiner", "completion_received"): _keep_fallback("refiner_head", "refiner_final", "content_head"),
+    ("checker", "verdict"): _keep_last("verdict", "verdict"),
+    ("arbiter", "decision"): _keep_last("arbiter", "chosen"),
+}
+
+def _scan_trace(trace: List[Event]) -> TraceSummary:
+    """
+    Extract every field analyze_trace_manually needs in one traversal.
+    
+    Answers track the best value seen so far: a final_extracted event settles the
+    answer for good, and a completion_received snippet is only kept as a fallback
+    until then. The solver's first completion is always kept for the 2.1 length check.
+    """
     seq = []
+    state: Dict[str, Any] = {
+        "solver_final": None, "solver_head": None,
+        "refiner_final": None, "refiner_head": None,
+        "verdict": "", "arbiter": "",
+    }
+    ended = False
     for event in trace:
-        agent = event.get("agent")
+        agent = event.agent
+        evt = event.event
         if agent and agent != "system":
             seq.append(agent)
-    return seq
+        # run_end counts from any agent, so it stays outside the (agent, event) table
+        if evt == "run_end":
+            ended = True
+            continue
+        handler = _EVENT_HANDLERS.get((agent, evt))
+        if handler is not None:
+            handler(state, event.data)
+
+    solver_final, refiner_final = state["solver_final"], state["refiner_final"]
+    solver_head, refiner_head = state["solver_head"], state["refiner_head"]
+    verdict, arbiter = state["verdict"], state["arbiter"]
+    # final_extracted wins; otherwise fall back to a snippet of the first completion
+    if solver_final is None:
+        solver_final = (solver_head or "")[:100]
+    if refiner_final is None:
+        refiner_final = refiner_head or ""
+    return TraceSummary(
+        agent_sequence=seq,
+        solver_answer=solver_final,
+        refiner_answer=refiner_final,
+        solver_completion_head=solver_head,
+        checker_verdict=verdict,
+        arbiter_choice=arbiter,
+        ended=ended,
+    )
+
+def get_agent_sequence(trace: List[Event]) -> List[str]:
+    """Extract ordered list of agents that executed."""
+    return _scan_trace(trace).agent_sequence
 
-def find_solver_answer(trace: List[Dict]) -> str:
+def find_solver_answer(trace: List[Event]) -> str:
     """Extract solver's final answer."""
-    for event in trace:
-        if event.get("agent") == "solver" and event.get("event") == "final_extracted":
-            return event.get("data", {}).get("final_answer", "") or ""
-    
-    # Fallback: check completion_received
-    for event in trace:
-        if event.get("agent") == "solver" and event.get("event") == "completion_received":
-            content = event.get("data", {}).get("content_head", "") or ""
-            return content[:100]  # Return snippet
-    
-    return ""
+    return _scan_trace(trace).solver_answer
 
-def find_refiner_answer(trace: List[Dict]) -> str:
+def find_refiner_answer(trace: List[Event]) -> str:
     """Extract refiner's final answer."""
-    for event in trace:
-        if event.get("agent") == "refiner" and event.get("event") == "final_extracted":
-            return event.get("data", {}).get("final_answer", "") or ""
-    
-    # Fallback: check completion_received
-    for event in trace:
-        if event.get("agent") == "refiner" and event.get("event") == "completion_received":
-            content = event.get("data", {}).get("content_head", "") or ""
-            return content[:100]
-    
-    return ""
+    return _scan_trace(trace).refiner_answer
 
-def find_checker_verdict(trace: List[Dict]) -> str:
+def find_checker_verdict(trace: List[Event]) -> str:
     """Extract checker's verdict (ACCEPT/REJECT)."""
-    verdict = ""
-    for event in trace:
-        if event.get("agent") == "checker" and event.get("event") == "verdict":
-            verdict = event.get("data", {}).get("verdict", "") or verdict
-    return verdict
+    return _scan_trace(trace).checker_verdict
 
-def find_arbiter_choice(trace: List[Dict]) -> str:
+def find_arbiter_choice(trace: List[Event]) -> str:
     """Extract arbiter's chosen answer."""
-    choice = ""
-    for event in trace:
-        if event.get("agent") == "arbiter" and event.get("event") == "decision":
-            choice = event.get("data", {}).get("chosen", "") or choice
-    return choice
+    return _scan_trace(trace).arbiter_choice
 
-def has_run_end(trace: List[Dict]) -> bool:
+def has_run_end(trace: List[Event]) -> bool:
     """Check if pipeline completed normally."""
-    return any(event.get("event") == "run_end" for event in trace)
+    return _scan_trace(trace).ended
 
 def normalize_answer(ans: str) -> str:
     """Normalize answer for comparison."""
-    import re
     if not ans:
         return ""
     ans = str(ans).strip()
-    ans = re.sub(r'\\text\{([^}]+)\}', r'\1', ans)
-    ans = re.sub(r'\\boxed\{([^}]+)\}', r'\1', ans)
-    ans = ans.replace('$', '').replace('\\', '').replace(' ', '')
-    ans = ans.replace('{', '').replace('}', '')
+    # Most answers carry no LaTeX wrappers; a substring test is far cheaper than a regex pass
+    if '\\text{' in ans:
+        ans = _TEXT_RE.sub(r'\1', ans)
+    if '\\boxed{' in ans:
+        ans = _BOXED_RE.sub(r'\1', ans)
+    ans = ans.translate(_STRIP_TABLE)
     return ans.lower()
 
 def answers_match(ans1: str, ans2: list) -> bool:
@@ -130,14 +281,21 @@ def answers_match(ans1: str, ans2: list) -> bool:
             return True
     return False
 
+def _normset(ans_list) -> frozenset:
+    """Normalize a ground-truth answer (or list of answers) once for repeated lookups."""
+    if ans_list is None:
+        return frozenset()
+    # Wrap anything that is not already a list (str, int, float, ...) so scalars never hit iteration
+    if not isinstance(ans_list, (list, tuple)):
+        ans_list = [ans_list]
+    return frozenset(normalize_answer(str(a)) for a in ans_list)
+
 # ---------- Manual Failure Mode Analysis ----------
 def analyze_trace_manually(
-    problem_id: str,
-    trace: List[Dict],
+    trace: List[Event],
     success: bool,
     pred_ans: str,
-    gt_ans: list,
-    problem_text: str
+    gt_ans: list
 ) -> Dict[str, Any]:
     """
     Analyze trace using custom failure mode taxonomy.
@@ -168,16 +326,23 @@ def analyze_trace_manually(
     """
     failure_modes: Dict[str, Dict[str, str]] = {}
     summary_points: List[str] = []
+    gt_norm = _normset(gt_ans)
     
     # Extract trace information
-    agent_sequence = get_agent_sequence(trace)
-    num_agents = len(set(agent_sequence))
+    scan = _scan_trace(trace)
+    agent_sequence = scan.agent_sequence
     
-    solver_ans = find_solver_answer(trace)
-    refiner_ans = find_refiner_answer(trace)
-    verdict = find_checker_verdict(trace)
-    arbiter_pick = find_arbiter_choice(trace)
-    ended = has_run_end(trace)
+    solver_ans = scan.solver_answer
+    refiner_ans = scan.refiner_answer
+    verdict = scan.checker_verdict
+    arbiter_pick = scan.arbiter_choice
+    ended = scan.ended
+    
+    # Normalize once; the 2.3, 4.1 and correctness checks all compare these
+    solver_norm = normalize_answer(solver_ans) if solver_ans else ""
+    refiner_norm = normalize_answer(refiner_ans) if refiner_ans else ""
+    agent_set = set(agent_sequence)
+    num_agents = len(agent_set)
     
     # ----- CATEGORY 1: Agent Orchestration Errors -----
     
@@ -206,7 +371,7 @@ def analyze_trace_manually(
     
     # 1.2 Missing Required Agent
     checker_rejected = (verdict == "REJECT")
-    if checker_rejected and "refiner" not in agent_sequence:
+    if checker_rejected and "refiner" not in agent_set:
         failure_modes["1.2"] = {
             "name": "Missing Required Agent",
             "definition": "Expected agent didn't run when it should have (e.g., no refiner after REJECT).",
@@ -231,14 +396,9 @@ def analyze_trace_manually(
         solver_failed = True
     else:
         # Check if solver output is too short (likely incomplete)
-        solver_event = next(
-            (e for e in trace if e.get("agent") == "solver" and e.get("event") == "completion_received"),
-            None
-        )
-        if solver_event:
-            content_head = solver_event.get("data", {}).get("content_head", "") or ""
-            if len(content_head) < 30:
-                solver_failed = True
+        content_head = scan.solver_completion_head
+        if content_head is not None and len(content_head) < 30:
+            solver_failed = True
     
     if solver_failed:
         failure_modes["2.1"] = {
@@ -249,7 +409,7 @@ def analyze_trace_manually(
         summary_points.append("Solver produced no/invalid answer")
     
     # 2.2 Checker Indecisiveness
-    if verdict not in ("ACCEPT", "REJECT") and "checker" in agent_sequence:
+    if verdict not in ("ACCEPT", "REJECT") and "checker" in agent_set:
         failure_modes["2.2"] = {
             "name": "Checker Indecisiveness",
             "definition": "Checker fails to give clear ACCEPT or REJECT verdict.",
@@ -259,7 +419,7 @@ def analyze_trace_manually(
     
     # 2.3 Refiner No-Op
     if refiner_ans and solver_ans:
-        if normalize_answer(refiner_ans) == normalize_answer(solver_ans) and not success:
+        if refiner_norm == solver_norm and not success:
             failure_modes["2.3"] = {
                 "name": "Refiner No-Op",
                 "definition": "Refiner produces identical answer to solver without improvement.",
@@ -268,7 +428,7 @@ def analyze_trace_manually(
             summary_points.append("Refiner made no changes")
     
     # 2.4 Arbiter Indecisiveness
-    if "arbiter" in agent_sequence and (arbiter_pick == "" or arbiter_pick is None):
+    if "arbiter" in agent_set and (arbiter_pick == "" or arbiter_pick is None):
         failure_modes["2.4"] = {
             "name": "Arbiter Indecisiveness",
             "definition": "Arbiter fails to select a final answer from candidates.",
@@ -299,12 +459,12 @@ def analyze_trace_manually(
     # ----- CATEGORY 4: Coordination Errors -----
     
     # Check if solver/refiner answers are correct
-    solver_correct = answers_match(solver_ans, gt_ans) if solver_ans else False
-    refiner_correct = answers_match(refiner_ans, gt_ans) if refiner_ans else False
+    solver_correct = solver_norm in gt_norm if solver_ans else False
+    refiner_correct = refiner_norm in gt_norm if refiner_ans else False
     
     # 4.1 Refiner Degradation
     if refiner_ans and solver_ans:
-        if normalize_answer(refiner_ans) != normalize_answer(solver_ans):
+        if refiner_norm != solver_norm:
             # Refiner changed the answer
             if solver_correct and not refiner_correct:
                 failure_modes["4.1"] = {
@@ -322,7 +482,7 @@ def analyze_trace_manually(
                 summary_points.append("Refiner didn't improve")
     
     # 4.2 Arbiter Poor Decision
-    if "arbiter" in agent_sequence and not success:
+    if "arbiter" in agent_set and not success:
         if solver_correct or refiner_correct:
             failure_modes["4.2"] = {
                 "name": "Arbiter Poor Decision",
@@ -369,6 +529,36 @@ def analyze_trace_manually(
         "summary": summary
     }
 
+def _process_one(args) -> Dict[str, Any]:
+    """Load one problem's trace and build its annotation record (process pool worker)."""
+    problem_id, eval_result, problem, pred = args
+    
+    # Load trace; an empty path never touches the filesystem
+    trace_file = pred.get("trace_file", "")
+    trace = load_trace(trace_file) if trace_file else []
+    
+    # Analyze
+    analysis = analyze_trace_manually(
+        trace,
+        eval_result["correct"],
+        eval_result["predicted"],
+        eval_result["ground_truth"]
+    )
+    
+    # Create annotation record
+    return {
+        "problem_id": problem_id,
+        "task": problem["question"][:200] + "...",
+        "trace_file": trace_file,
+        "num_agents": analysis["num_agents"],
+        "agent_sequence": analysis["agent_sequence"],
+        "success": eval_result["correct"],
+        "predicted_answer": eval_result["predicted"],
+        "ground_truth": eval_result["ground_truth"],
+        "identified_failure_modes": analysis["failure_modes"],
+        "summary": analysis["summary"]
+    }
+
 # ---------- Main ----------
 def main():
     print("="*80)
@@ -377,24 +567,23 @@ def main():
     
     # Load data
     print("\n[1/4] Loading data...")
-    dataset = load_json(DATASET_PATH)
+    # Dataset and predictions are only used by id, so they are streamed straight into lookups
+    dataset_lookup = load_id_lookup(DATASET_PATH)
     agent_eval = load_json(AGENT_EVAL_PATH)
-    predictions = load_json(PREDICTIONS_PATH)
+    pred_lookup = load_id_lookup(PREDICTIONS_PATH)
     
-    print(f"  Dataset: {len(dataset)} problems")
+    print(f"  Dataset: {len(dataset_lookup)} problems")
     print(f"  Evaluation: {agent_eval['correct']}/{agent_eval['total']} correct ({agent_eval['accuracy']:.2%})")
-    print(f"  Predictions: {len(predictions)} results")
+    print(f"  Predictions: {len(pred_lookup)} results")
     
     # Create lookups
     print("\n[2/4] Creating lookups...")
-    dataset_lookup = {str(item["id"]): item for item in dataset}
     eval_lookup = {r["id"]: r for r in agent_eval["details"]}
-    pred_lookup = {str(p["id"]): p for p in predictions}
     
     # Annotate each problem
     print("\n[3/4] Analyzing traces...")
-    annotations = []
-    
+    jobs = []
+    job_indices = []
     for idx, (problem_id, eval_result) in enumerate(eval_lookup.items(), 1):
         problem = dataset_lookup.get(problem_id)
         pred = pred_lookup.get(problem_id)
@@ -403,39 +592,21 @@ def main():
             print(f"  [{idx}/{len(eval_lookup)}] {problem_id} - SKIPPED (missing data)")
             continue
         
-        # Load trace
-        trace_file = pred.get("trace_file", "")
-        if trace_file:
-            trace = load_trace(trace_file)
-        else:
-            trace = []
-        
-        # Analyze
-        analysis = analyze_trace_manually(
-            problem_id,
-            trace,
-            eval_result["correct"],
-            eval_result["predicted"],
-            eval_result["ground_truth"],
-            problem["question"]
-        )
-        
-        # Create annotation record
-        annotation = {
-            "problem_id": problem_id,
-            "task": problem["question"][:200] + "...",
-            "trace_file": trace_file,
-            "num_agents": analysis["num_agents"],
-            "agent_sequence": analysis["agent_sequence"],
-            "success": eval_result["correct"],
-            "predicted_answer": eval_result["predicted"],
-            "ground_truth": eval_result["ground_truth"],
-            "identified_failure_modes": analysis["failure_modes"],
-            "summary": analysis["summary"]
-        }
-        
-        annotations.append(annotation)
-        print(f"  [{idx}/{len(eval_lookup)}] {problem_id} - {analysis['summary'][:60]}")
+        jobs.append((problem_id, eval_result, problem, pred))
+        job_indices.append(idx)
+    
+    # Problems are independent, so fan them out across cores; map() keeps input order
+    annotations: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_process_one, jobs, chunksize=8)
+        if tqdm is not None:
+            results = tqdm(results, total=len(jobs))
+        for i, annotation in enumerate(results):
+            annotations[i] = annotation
+            # Without tqdm, report every PROGRESS_EVERY-th problem (and the last) instead of each one
+            done = i + 1
+            if tqdm is None and (done % PROGRESS_EVERY == 0 or done == len(jobs)):
+                print(f"  [{job_indices[i]}/{len(eval_lookup)}] {annotation['problem_id']} - {annotation['summary'][:60]}")
     
     # Save
     print(f"\n[4/4] Saving annotations...")
@@ -452,18 +623,16 @@ def main():
     # Failure mode distribution
     from collections import Counter
     fm_counts = Counter()
+    fm_names: Dict[str, str] = {}
+    # Count codes and remember each code's name from its first occurrence in one pass
     for ann in annotations:
-        for fm_code in ann["identified_failure_modes"].keys():
+        for fm_code, fm_info in ann["identified_failure_modes"].items():
             fm_counts[fm_code] += 1
+            fm_names.setdefault(fm_code, fm_info.get("name", fm_code))
     
     print(f"\nFailure Mode Distribution:")
     for fm_code, count in sorted(fm_counts.items()):
-        fm_name = annotations[0]["identified_failure_modes"].get(fm_code, {}).get("name", fm_code)
-        # Get actual name from first occurrence
-        for ann in annotations:
-            if fm_code in ann["identified_failure_modes"]:
-                fm_name = ann["identified_failure_modes"][fm_code]["name"]
-                break
+        fm_name = fm_names[fm_code]
         print(f"  {fm_code} {fm_name}: {count}")
     
     print(f"\n{'='*80}")
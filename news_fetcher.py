@@ -7,42 +7,112 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 import os
+import re
+import json
+import time
+import hashlib
 import logging
-with open("combined_fetcher.py") as file:
-    exec(file.read())
+from pathlib import Path
+import asyncio
+import aiohttp
+import combined_fetcher
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Load SpaCy model
-nlp = spacy.load('en_core_web_sm')
+# Build the gaming Excel report first; exec'ing the file as __main__ used to run this implicitly
+combined_fetcher.main()
+
+# Summaries only need sentence boundaries, so a blank pipeline with the rule-based
+# sentencizer replaces the statistical en_core_web_sm parser. It handles abbreviations
+# only marginally better than a punctuation regex would, which is enough here.
+nlp = spacy.blank('en')
+nlp.add_pipe('sentencizer')
 
 # Define the list of news sources
 news_sources = [
 ]
 
+# Article URLs discovered by newspaper.build are cached per source for this long
+NEWS_CACHE_DIR = Path(__file__).with_name('.cache')
+NEWS_CACHE_TTL = 60 * 60
+
+# Function to build a newspaper source, reusing its cached article URLs while they are fresh
+def build_paper(source):
+    cache_path = NEWS_CACHE_DIR / f"news_{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < NEWS_CACHE_TTL:
+            with cache_path.open(encoding='utf-8') as f:
+                urls = json.load(f)
+            # Source objects hold lxml trees and don't pickle, so rebuild one around the cached URLs
+            paper = newspaper.Source(source, memoize_articles=False)
+            paper.articles = [newspaper.Article(url, source_url=source) for url in urls]
+            return paper
+    except (OSError, ValueError):
+        pass
+
+    paper = newspaper.build(source, memoize_articles=False)
+    try:
+        NEWS_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump([article.url for article in paper.articles], f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.error(f"Error writing news cache for {source}: {e}")
+    return paper
+
 # Build newspaper objects for each source
-papers = [newspaper.build(source, memoize_articles=False) for source in news_sources]
+papers = [build_paper(source) for source in news_sources]
 
 # Set the news pool with threads
 news_pool.set(papers, threads_per_source=2)
 news_pool.join()
 
-# Function to summarize text using SpaCy
-def summarize_text(text):
-    doc = nlp(text)
+# Function to summarize a parsed SpaCy doc
+def summarize_doc(doc):
     sentences = [sent.text for sent in doc.sents]
     summary_length = min(5, len(sentences))  # Get up to 5 sentences for the summary
     summary = ' '.join(sentences[:summary_length])
     return summary
 
+# Function to summarize text using SpaCy
+def summarize_text(text):
+    return summarize_doc(nlp(text))
+
+# Function to summarize many texts in batches with nlp.pipe
+def summarize_texts(texts, batch_size=64):
+    return [summarize_doc(doc) for doc in nlp.pipe(texts, batch_size=batch_size)]
+
+# Function to compile phrases into one trie-shaped regex, e.g. ['foobar', 'foxar'] -> fo(?:obar|xar)
+def build_phrase_regex(phrases):
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}  # Marks the end of a phrase
+
+    def to_pattern(node):
+        # A phrase ends here, so longer phrases sharing this prefix can never add a match
+        if '' in node:
+            return ''
+        alternatives = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items())]
+        return alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+
+    return re.compile(to_pattern(trie)) if phrases else None
+
+# Titles containing any of these phrases are dropped
+unwanted_phrases = [
+]
+unwanted_phrases_re = build_phrase_regex(unwanted_phrases)
+
 # Function to clean up and filter articles
 def filter_articles(articles):
     filtered_articles = []
     seen_titles = set()
-    unwanted_phrases = [
-    ]
 
     for article in articles:
-        if any(phrase in article['title'] for phrase in unwanted_phrases):
+        # One linear regex scan per title instead of a substring test per phrase
+        if unwanted_phrases_re and unwanted_phrases_re.search(article['title']):
             continue
         if article['title'] in seen_titles:
             continue
@@ -51,30 +121,53 @@ def filter_articles(articles):
 
     return filtered_articles
 
+# Download article HTML concurrently instead of one blocking request at a time
+async def fetch_html(session, semaphore, url):
+    async with semaphore:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            # Non-2xx pages surface as exceptions so they are logged and skipped like newspaper's download()
+            response.raise_for_status()
+            return await response.text()
+
+async def download_articles(urls, max_concurrency=32):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(*(fetch_html(session, semaphore, url) for url in urls), return_exceptions=True)
+
 # Fetch and summarize articles
 def fetch_and_summarize_articles(papers):
-    articles_info = []
+    articles = []
 
     for paper in papers:
         logging.info(f"Processing paper: {paper.brand}")
         if not paper.articles:
             logging.info(f"No articles found for {paper.brand}")
             continue
-        for article in paper.articles[:7]:  # Get the first 7 articles from each source
-            try:
-                article.download()
-                article.parse()
-                article.nlp()
-                summary = summarize_text(article.text)
-
-                articles_info.append({
-                    'title': article.title,
-                    'summary': summary,
-                    'url': article.url,
-                    'html': article.article_html
-                })
-            except Exception as e:
-                logging.error(f"Error parsing article from {article.url}: {e}")
+        articles.extend(paper.articles[:7])  # Get the first 7 articles from each source
+
+    htmls = asyncio.run(download_articles([article.url for article in articles]))
+
+    parsed_articles = []
+    for article, html in zip(articles, htmls):
+        if isinstance(html, Exception):
+            logging.error(f"Error downloading article from {article.url}: {html}")
+            continue
+        try:
+            article.set_html(html)
+            article.parse()
+            article.nlp()
+            parsed_articles.append(article)
+        except Exception as e:
+            logging.error(f"Error parsing article from {article.url}: {e}")
+
+    # Summarize every parsed article in one batched SpaCy pass
+    summaries = summarize_texts([article.text for article in parsed_articles])
+    articles_info = [{
+        'title': article.title,
+        'summary': summary,
+        'url': article.url,
+        'html': article.article_html
+    } for article, summary in zip(parsed_articles, summaries)]
 
     return filter_articles(articles_info)
 